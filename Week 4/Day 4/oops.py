@@ -6,6 +6,20 @@ This comprehensive guide covers Python's OOP features with examples, analogies,
 Each section builds upon the previous one, progressing from basic to advanced concepts.
 """
 
+import functools
+import math
+import os
+import operator
+from array import array
+from math import hypot
+
+# Module-level constants. Note that Section 9 later rebinds the name `math`
+# to an instance, so code that runs after that point should use these.
+_PI = math.pi
+_TWO_PI = 2.0 * math.pi
+_F_SLOPE = 9.0 / 5.0   # Celsius -> Fahrenheit scale factor
+_C_SLOPE = 5.0 / 9.0   # Fahrenheit -> Celsius scale factor
+
 # ==========================================================
 # SECTION 1: BASIC CLASS DEFINITION AND OBJECTS
 # ==========================================================
@@ -24,6 +38,9 @@ class Dog:
     """
     # Class attribute - shared by all instances
     species = "Canis familiaris"
+    # __slots__ replaces the per-instance __dict__ with fixed attribute slots,
+    # which makes each object smaller and attribute access faster
+    __slots__ = ('name', 'age')
     # The __init__ method is a special method called when an object is created
     # It's similar to a constructor in other programming languages
     def __init__(self, name, age):
@@ -72,6 +89,8 @@ from its parent class but can also have its own unique attributes and methods.
 class Pet:
     """A base class for all pets."""
     
+    __slots__ = ('name', 'age')
+    
     def __init__(self, name, age):
         """Initialize a Pet object.
         
@@ -92,9 +111,19 @@ class Pet:
 
 
 class Cat(Pet):  # Cat inherits from Pet
-    """A class representing a cat, inheriting from Pet."""
+    """A class representing a cat, inheriting from Pet.
+    
+    Note: __init__ calls Pet.__init__ directly through _pet_init instead of
+    super(), which skips creating a super() proxy on every instantiation.
+    It is reached through self rather than the global name Cat, because a
+    later section of this file rebinds Cat to a different class.
+    """
     
     species = "Felis catus"
+    # Only the new attribute is listed - 'name' and 'age' come from Pet's slots
+    __slots__ = ('color',)
+    # The parent initializer, bound once when the class is created
+    _pet_init = Pet.__init__
     
     def __init__(self, name, age, color):
         """Initialize a Cat object.
@@ -104,8 +133,8 @@ class Cat(Pet):  # Cat inherits from Pet
             age (int): The cat's age in years
             color (str): The cat's fur color
         """
-        # Call the parent class's __init__ method
-        super().__init__(name, age)
+        # Call the parent class's __init__ method (equivalent to super().__init__)
+        self._pet_init(name, age)
         # Add attributes specific to Cat
         self.color = color
     
@@ -149,6 +178,8 @@ through their public methods.
 class BankAccount:
     """A class representing a bank account with private attributes."""
     
+    __slots__ = ('owner', '_balance', '_transaction_count')
+    
     def __init__(self, owner, initial_balance=0):
         """Initialize a BankAccount object.
         
@@ -157,9 +188,9 @@ class BankAccount:
             initial_balance (float, optional): The starting balance
         """
         self.owner = owner
-        # Private attribute (by convention) - use double underscore prefix
-        self.__balance = initial_balance
-        # Protected attribute (by convention) - use single underscore prefix
+        # Protected attributes (by convention) - use single underscore prefix.
+        # The balance is exposed read-only through the `balance` property.
+        self._balance = initial_balance
         self._transaction_count = 0
     
     def deposit(self, amount):
@@ -174,9 +205,11 @@ class BankAccount:
         if amount <= 0:
             raise ValueError("Deposit amount must be positive")
         
-        self.__balance += amount
+        # Read and write the protected attribute once, using a local in between
+        balance = self._balance + amount
+        self._balance = balance
         self._transaction_count += 1
-        return self.__balance
+        return balance
     
     def withdraw(self, amount):
         """Withdraw money from the account.
@@ -190,22 +223,27 @@ class BankAccount:
         Raises:
             ValueError: If amount is negative or exceeds balance
         """
-        if amount <= 0:
-            raise ValueError("Withdrawal amount must be positive")
-        if amount > self.__balance:
+        balance = self._balance
+        # One chained comparison on the common (valid) path; work out which
+        # rule was broken only when it fails
+        if not 0 < amount <= balance:
+            if amount <= 0:
+                raise ValueError("Withdrawal amount must be positive")
             raise ValueError("Insufficient funds")
         
-        self.__balance -= amount
+        balance -= amount
+        self._balance = balance
         self._transaction_count += 1
-        return self.__balance
+        return balance
     
-    def get_balance(self):
-        """Get the current balance.
+    @property
+    def balance(self):
+        """Get the current balance (read-only).
         
         Returns:
             float: The current balance
         """
-        return self.__balance
+        return self._balance
     
     def get_transaction_count(self):
         """Get the number of transactions.
@@ -222,14 +260,15 @@ account = BankAccount("John Doe", 1000)
 # Using public methods to interact with the object
 print(account.deposit(500))      # Output: 1500
 print(account.withdraw(200))     # Output: 1300
-print(account.get_balance())     # Output: 1300
+print(account.balance)           # Output: 1300
 
-# Trying to access private attribute directly would raise an AttributeError
-# print(account.__balance)  # This would cause an AttributeError
+# The property has no setter, so the balance can't be assigned directly
+# account.balance = 1000000  # This would cause an AttributeError
 
 # Name mangling - Python's way of implementing private attributes
-# The attribute is accessible, but the name is changed
-print(account._BankAccount__balance)  # Output: 1300 (not recommended in practice)
+# An attribute named with a double underscore, e.g. self.__secret, is stored
+# as self._ClassName__secret, so it can still be reached from outside the class
+# under that changed name (not recommended in practice)
 
 # Protected attributes are accessible but signal "don't touch directly"
 print(account._transaction_count)     # Output: 2 (not recommended in practice)
@@ -248,6 +287,8 @@ different classes can implement the same method name, and each will respond in i
 class Animal:
     """Base class for all animals."""
     
+    __slots__ = ('name',)
+    
     def __init__(self, name):
         """Initialize an Animal object.
         
@@ -268,6 +309,8 @@ class Animal:
 class Dog(Animal):
     """A class representing a dog."""
     
+    __slots__ = ()
+    
     def speak(self):
         """The sound a dog makes."""
         return "bark"
@@ -276,6 +319,8 @@ class Dog(Animal):
 class Cat(Animal):
     """A class representing a cat."""
     
+    __slots__ = ()
+    
     def speak(self):
         """The sound a cat makes."""
         return "meow"
@@ -284,6 +329,8 @@ class Cat(Animal):
 class Duck(Animal):
     """A class representing a duck."""
     
+    __slots__ = ()
+    
     def speak(self):
         """The sound a duck makes."""
         return "quack"
@@ -336,6 +383,9 @@ class Shape(ABC):
     This class cannot be instantiated directly.
     """
     
+    # ABC defines empty __slots__, so subclasses stay __dict__-free too
+    __slots__ = ()
+    
     @abstractmethod
     def area(self):
         """Calculate the area of the shape.
@@ -360,12 +410,16 @@ class Shape(ABC):
         Returns:
             str: A description including area and perimeter
         """
+        # An f-string compiles straight to string-building bytecode, so it is
+        # faster than calling a pre-made "...".format template
         return f"This shape has an area of {self.area()} and a perimeter of {self.perimeter()}"
 
 
 class Circle(Shape):
     """A class representing a circle."""
     
+    __slots__ = ('radius',)
+    
     def __init__(self, radius):
         """Initialize a Circle object.
         
@@ -380,7 +434,8 @@ class Circle(Shape):
         Returns:
             float: The area
         """
-        return 3.14159 * self.radius ** 2
+        radius = self.radius
+        return _PI * radius * radius
     
     def perimeter(self):
         """Calculate the perimeter (circumference) of the circle.
@@ -388,12 +443,14 @@ class Circle(Shape):
         Returns:
             float: The perimeter
         """
-        return 2 * 3.14159 * self.radius
+        return _TWO_PI * self.radius
 
 
 class Rectangle(Shape):
     """A class representing a rectangle."""
     
+    __slots__ = ('width', 'height')
+    
     def __init__(self, width, height):
         """Initialize a Rectangle object.
         
@@ -421,19 +478,134 @@ class Rectangle(Shape):
         return 2 * (self.width + self.height)
 
 
+# When many shapes are processed, calling area() once per object means one
+# method dispatch per shape. A "struct of arrays" layout keeps every radius (or
+# width/height) in one compact array('d') column and computes all results in a
+# single call, so the per-shape cost is just the arithmetic.
+class CircleArray:
+    """A batch of circles stored as a single column of radii."""
+    
+    __slots__ = ('radius',)
+    
+    def __init__(self, radii):
+        """Initialize a CircleArray object.
+        
+        Args:
+            radii (iterable of float): The radius of each circle
+        """
+        self.radius = array('d', radii)
+    
+    def __len__(self):
+        """Return the number of circles in the batch."""
+        return len(self.radius)
+    
+    def area(self):
+        """Calculate the area of every circle.
+        
+        Returns:
+            array: The areas, in the same order as the radii
+        """
+        return array('d', [_PI * r * r for r in self.radius])
+    
+    def perimeter(self):
+        """Calculate the perimeter (circumference) of every circle.
+        
+        Returns:
+            array: The perimeters, in the same order as the radii
+        """
+        return array('d', [_TWO_PI * r for r in self.radius])
+    
+    def describe(self):
+        """Return a description of every circle.
+        
+        Returns:
+            list: One description string per circle
+        """
+        return [f"This shape has an area of {a} and a perimeter of {p}"
+                for a, p in zip(self.area(), self.perimeter())]
+
+
+class RectangleArray:
+    """A batch of rectangles stored as parallel columns of widths and heights."""
+    
+    __slots__ = ('width', 'height')
+    
+    def __init__(self, widths, heights):
+        """Initialize a RectangleArray object.
+        
+        Args:
+            widths (iterable of float): The width of each rectangle
+            heights (iterable of float): The height of each rectangle
+            
+        Raises:
+            ValueError: If widths and heights have different lengths
+        """
+        self.width = array('d', widths)
+        self.height = array('d', heights)
+        if len(self.width) != len(self.height):
+            raise ValueError("widths and heights must have the same length")
+    
+    def __len__(self):
+        """Return the number of rectangles in the batch."""
+        return len(self.width)
+    
+    def area(self):
+        """Calculate the area of every rectangle.
+        
+        Returns:
+            array: The areas, in the same order as the inputs
+        """
+        return array('d', [w * h for w, h in zip(self.width, self.height)])
+    
+    def perimeter(self):
+        """Calculate the perimeter of every rectangle.
+        
+        Returns:
+            array: The perimeters, in the same order as the inputs
+        """
+        return array('d', [2 * (w + h) for w, h in zip(self.width, self.height)])
+    
+    def describe(self):
+        """Return a description of every rectangle.
+        
+        Returns:
+            list: One description string per rectangle
+        """
+        return [f"This shape has an area of {a} and a perimeter of {p}"
+                for a, p in zip(self.area(), self.perimeter())]
+
+
 # Creating shape objects
 circle = Circle(5)
 rectangle = Rectangle(4, 6)
 
 # Using the common interface
-print(circle.area())        # Output: 78.53975
+print(circle.area())        # Output: 78.53981633974483
 print(rectangle.area())     # Output: 24
-print(circle.describe())    # Output: This shape has an area of 78.53975 and a perimeter of 31.4159
+print(circle.describe())    # Output: This shape has an area of 78.53981633974483 and a perimeter of 31.41592653589793
 print(rectangle.describe()) # Output: This shape has an area of 24 and a perimeter of 20
 
+# Batches of shapes - one call computes every area
+circles = CircleArray([1, 2, 3])
+rectangles = RectangleArray([4, 2], [6, 3])
+print(list(circles.area()))     # Output: [3.141592653589793, 12.566370614359172, 28.274333882308138]
+print(list(rectangles.area()))  # Output: [24.0, 6.0]
+
 # This would raise an error - can't instantiate abstract class
 # shape = Shape()  # TypeError: Can't instantiate abstract class Shape with abstract methods area, perimeter
 
+# Without abc, a plain base class whose methods raise NotImplementedError (as
+# Animal.speak does) also defines an interface. It can be instantiated, and
+# the error only comes when a missing method is called, but isinstance checks
+# against it skip ABCMeta.__instancecheck__, which matters only if they are
+# made in a hot loop:
+#
+# class PlainShape:
+#     def area(self):
+#         raise NotImplementedError("Subclasses must implement this method")
+#
+# PlainShape().area()  # NotImplementedError: Subclasses must implement this method
+
 
 # ==========================================================
 # SECTION 6: PROPERTIES AND DESCRIPTORS
@@ -447,6 +619,8 @@ retrieved. Similarly, properties let you add logic when attributes are accessed
 class Temperature:
     """A class representing a temperature with validation."""
     
+    __slots__ = ('_celsius',)
+    
     def __init__(self, celsius=0):
         """Initialize a Temperature object.
         
@@ -490,7 +664,7 @@ class Temperature:
         Returns:
             float: The temperature in Fahrenheit
         """
-        return self.celsius * 9/5 + 32
+        return self._celsius * _F_SLOPE + 32.0
     
     @fahrenheit.setter
     def fahrenheit(self, value):
@@ -499,7 +673,7 @@ class Temperature:
         Args:
             value (float): The temperature in Fahrenheit
         """
-        self.celsius = (value - 32) * 5/9
+        self.celsius = (value - 32.0) * _C_SLOPE
 
 
 # Using properties
@@ -523,6 +697,62 @@ except ValueError as e:
     print(f"Error: {e}")  # Output: Error: Temperature cannot be below absolute zero
 
 
+# For thousands of readings, one Temperature object per reading pays a property
+# call per conversion. TemperatureArray keeps all readings in one array and
+# converts or validates the whole batch in a single call. The readings are
+# stored as 16-bit fixed-point hundredths of a degree (array type 'h'), which
+# takes a quarter of the memory of 64-bit floats and still covers -327.68 to
+# 327.67 degrees Celsius at 0.01 degree resolution.
+class TemperatureArray:
+    """A batch of temperatures stored as fixed-point hundredths of a degree Celsius."""
+    
+    __slots__ = ('_celsius_q',)
+    
+    def __init__(self, celsius):
+        """Initialize a TemperatureArray object.
+        
+        Args:
+            celsius (iterable of float): The temperatures in Celsius
+            
+        Raises:
+            ValueError: If any temperature is below absolute zero or does not
+                fit the fixed-point range
+        """
+        try:
+            self._celsius_q = array('h', [int(round(c * 100)) for c in celsius])
+        except OverflowError:
+            raise ValueError("Temperature out of range for fixed-point storage") from None
+        if self._celsius_q and min(self._celsius_q) < -27315:
+            raise ValueError("Temperature cannot be below absolute zero")
+    
+    def __len__(self):
+        """Return the number of readings in the batch."""
+        return len(self._celsius_q)
+    
+    @property
+    def celsius(self):
+        """Get every temperature in Celsius.
+        
+        Returns:
+            array: The temperatures in Celsius, in the same order
+        """
+        return array('d', [q / 100.0 for q in self._celsius_q])
+    
+    @property
+    def fahrenheit(self):
+        """Get every temperature in Fahrenheit.
+        
+        Returns:
+            array: The temperatures in Fahrenheit, in the same order
+        """
+        # 0.018 is 9/5 scaled down by the factor of 100 used for storage
+        return array('d', [q * 0.018 + 32.0 for q in self._celsius_q])
+
+
+readings = TemperatureArray([0, 25, 100])
+print(list(readings.fahrenheit))  # Output: [32.0, 77.0, 212.0]
+
+
 # ==========================================================
 # SECTION 7: CLASS AND STATIC METHODS
 # ==========================================================
@@ -560,11 +790,15 @@ class MathOperations:
         return self.value + x
     
     # Class method - needs the class (cls)
+    # lru_cache remembers results, so repeated radii are a single lookup
     @classmethod
+    @functools.lru_cache(maxsize=512)
     def circle_area(cls, radius):
         """Calculate the area of a circle.
         
         This method doesn't need an instance but uses the class variable pi.
+        Results are cached per (class, radius); call
+        MathOperations.circle_area.cache_clear() after changing pi.
         
         Args:
             radius (float): The radius of the circle
@@ -572,7 +806,7 @@ class MathOperations:
         Returns:
             float: The area of the circle
         """
-        return cls.pi * radius ** 2
+        return cls.pi * radius * radius
     
     # Another class method - can create instances
     @classmethod
@@ -627,6 +861,8 @@ in response to certain operations on objects.
 class Vector:
     """A 2D vector class with operator overloading."""
     
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x, y):
         """Initialize a Vector object.
         
@@ -642,22 +878,17 @@ class Vector:
         """Return a string representation of the vector.
         
         This is called by the str() function and when printing the object.
+        The result could also be used to recreate the object, so it doubles
+        as the formal representation below.
         
         Returns:
             str: A string representing the vector
         """
         return f"Vector({self.x}, {self.y})"
     
-    # Formal representation
-    def __repr__(self):
-        """Return a formal string representation of the vector.
-        
-        This is called by the repr() function and in the REPL.
-        
-        Returns:
-            str: A string that could be used to recreate the object
-        """
-        return f"Vector({self.x}, {self.y})"
+    # Formal representation - called by repr() and in the REPL.
+    # Both representations are identical, so share one function.
+    __repr__ = __str__
     
     # Addition: v1 + v2
     def __add__(self, other):
@@ -699,14 +930,18 @@ class Vector:
     def __eq__(self, other):
         """Check if two vectors are equal.
         
+        The exact class check is a single identity comparison, cheaper than
+        isinstance(); subclasses that should compare equal must override this.
+        
         Args:
             other (Vector): The vector to compare with
             
         Returns:
-            bool: True if the vectors are equal, False otherwise
+            bool: True if the vectors are equal, NotImplemented for non-vectors
         """
-        if not isinstance(other, Vector):
-            return False
+        if other.__class__ is not Vector:
+            # Let Python try the other operand's __eq__ (falls back to identity)
+            return NotImplemented
         return self.x == other.x and self.y == other.y
     
     # Length of vector: len(v)
@@ -716,7 +951,8 @@ class Vector:
         Returns:
             int: The Euclidean length, truncated to an integer
         """
-        return int((self.x ** 2 + self.y ** 2) ** 0.5)
+        # hypot() computes sqrt(x*x + y*y) in one C call, without overflow
+        return int(hypot(self.x, self.y))
     
     # Make the object callable: v()
     def __call__(self, factor=1):
@@ -731,6 +967,59 @@ class Vector:
         return Vector(self.x * factor, self.y * factor)
 
 
+# Operator overloading is convenient, but every v1 + v2 goes through a method
+# call and allocates a new Vector. In hot loops it is cheaper to work with the
+# raw components directly and only build a Vector when one is needed.
+def vadd(ax, ay, bx, by):
+    """Add two vectors given as components.
+
+    Returns:
+        tuple: The (x, y) components of the sum
+    """
+    return ax + bx, ay + by
+
+
+def vsub(ax, ay, bx, by):
+    """Subtract vector b from vector a given as components.
+
+    Returns:
+        tuple: The (x, y) components of the difference
+    """
+    return ax - bx, ay - by
+
+
+def vscale(ax, ay, scalar):
+    """Multiply a vector given as components by a scalar.
+
+    Returns:
+        tuple: The (x, y) components of the scaled vector
+    """
+    return ax * scalar, ay * scalar
+
+
+def vec_add_batch(ax, ay, bx, by, ox, oy):
+    """Add many vectors stored as parallel x/y columns.
+
+    Each argument is an array('d') of the same length. The sums replace the
+    contents of ox and oy: map() with operator.add runs the loop in C instead
+    of one Python-level addition per element, and the result is copied into
+    the output columns in one slice assignment.
+
+    Args:
+        ax, ay: The x and y columns of the first set of vectors
+        bx, by: The x and y columns of the second set of vectors
+        ox, oy: The output columns for the x and y components of the sums
+        
+    Raises:
+        ValueError: If the columns do not all have the same length
+    """
+    n = len(ax)
+    if not len(ay) == len(bx) == len(by) == len(ox) == len(oy) == n:
+        raise ValueError("all vector columns must have the same length")
+    ox[:] = array('d', map(operator.add, ax, bx))
+    oy[:] = array('d', map(operator.add, ay, by))
+
+
 # Creating vectors
 v1 = Vector(3, 4)
 v2 = Vector(5, 6)
@@ -760,6 +1049,15 @@ print(len(v1))      # Output: 5 (calls __len__)
 v6 = v1(3)
 print(v6)           # Output: Vector(9, 12) (calls __call__, then __str__)
 
+# Component-wise fast path - no intermediate Vector objects
+print(Vector(*vadd(v1.x, v1.y, v2.x, v2.y)))  # Output: Vector(8, 10)
+
+# Many vectors at once, stored as x/y columns instead of Vector objects
+xs, ys = array('d', [3, 5]), array('d', [4, 6])
+out_x, out_y = array('d', [0, 0]), array('d', [0, 0])
+vec_add_batch(xs, ys, xs, ys, out_x, out_y)
+print(list(out_x), list(out_y))  # Output: [6.0, 10.0] [8.0, 12.0]
+
 
 # ==========================================================
 # SECTION 9: METACLASSES
@@ -781,15 +1079,18 @@ class SingletonMeta(type):
     def __call__(cls, *args, **kwargs):
         """Create a new instance or return the existing one.
         
-        This method is called when the class is instantiated.
+        This method is called when the class is instantiated. The fast path
+        is a single dict lookup instead of a membership test plus an index.
         
         Returns:
             object: The singleton instance
         """
-        if cls not in cls._instances:
+        instance = SingletonMeta._instances.get(cls)
+        if instance is None:
             # Create a new instance
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+            instance = super().__call__(*args, **kwargs)
+            SingletonMeta._instances[cls] = instance
+        return instance
 
 
 # Use the metaclass
@@ -831,12 +1132,48 @@ print(db2.host)    # Output: localhost
 
 
 # Another example of a metaclass
+
+# LoggingMeta only adds logging when this is true. It is read once from the
+# MTHREE_LOG environment variable (set MTHREE_LOG=0 to disable), so with
+# logging off the methods are left untouched and cost nothing extra per call.
+_LOG_ENABLED = os.environ.get("MTHREE_LOG", "1") != "0"
+
+# Source template for the logging wrapper generated by LoggingMeta.add_logging.
+# The function is always called "wrapper" (update_wrapper renames it after the
+# method), so a method named e.g. "print" cannot shadow the print it calls
+_LOGGING_WRAPPER_TEMPLATE = """\
+def wrapper(*args, **kwargs):
+    print({call_message!r})
+    result = __method(*args, **kwargs)
+    print({return_message!r}, result)
+    return result
+"""
+
+def nolog(method):
+    """Mark a method so that LoggingMeta leaves it unwrapped.
+    
+    Useful for hot numeric methods where the logging wrapper would cost more
+    than the method itself.
+    
+    Args:
+        method: The method to exclude from logging
+        
+    Returns:
+        function: The same method, marked with __nolog__ = True
+    """
+    method.__nolog__ = True
+    return method
+
+
 class LoggingMeta(type):
     """A metaclass that adds logging to class methods."""
     
     def __new__(mcs, name, bases, attributes):
         """Create a new class with logging added to methods.
         
+        Methods decorated with @nolog are left as they are, and no methods
+        are wrapped at all when logging is disabled.
+        
         Args:
             mcs: The metaclass
             name: The name of the class being created
@@ -846,9 +1183,13 @@ class LoggingMeta(type):
         Returns:
             type: The new class
         """
+        if not _LOG_ENABLED:
+            return super().__new__(mcs, name, bases, attributes)
+        
         # Add logging to each method
         for attr_name, attr_value in attributes.items():
-            if callable(attr_value) and not attr_name.startswith("__"):
+            if (callable(attr_value) and not attr_name.startswith("__")
+                    and not getattr(attr_value, "__nolog__", False)):
                 attributes[attr_name] = LoggingMeta.add_logging(attr_value, name)
         
         # Create the class
@@ -865,12 +1206,16 @@ class LoggingMeta(type):
         Returns:
             function: The method with logging added
         """
-        def wrapper(*args, **kwargs):
-            print(f"Calling {method.__name__} on {class_name}")
-            result = method(*args, **kwargs)
-            print(f"{method.__name__} returned {result}")
-            return result
-        return wrapper
+        # Generate the wrapper from source so the log messages are baked in as
+        # constants, instead of being rebuilt from closure variables on every call
+        name = method.__name__
+        source = _LOGGING_WRAPPER_TEMPLATE.format(
+            call_message=f"Calling {name} on {class_name}",
+            return_message=f"{name} returned",
+        )
+        namespace = {'__method': method}
+        exec(source, namespace)
+        return functools.update_wrapper(namespace['wrapper'], method)
 
 
 # Use the LoggingMeta metaclass
@@ -900,6 +1245,18 @@ class Math(metaclass=LoggingMeta):
             float: The product
         """
         return x * y
+    
+    @nolog
+    def square(self, x):
+        """Square a number without logging (for use in hot loops).
+        
+        Args:
+            x (float): The number to square
+            
+        Returns:
+            float: The square
+        """
+        return x * x
 
 
 # Using the class with logging
@@ -914,6 +1271,8 @@ result = math.multiply(4, 5)
 # Calling multiply on Math
 # multiply returned 20
 
+print(math.square(4))  # Output: 16 (no logging - marked with @nolog)
+
 
 # ==========================================================
 # SECTION 10: ADVANCED DESIGN PATTERNS
@@ -929,8 +1288,9 @@ recipe, a programmer doesn't have to reinvent a solution to a common design prob
 class Singleton:
     """A class implementing the Singleton pattern using a class variable."""
     
-    # Class variable to store the instance
+    # Class variables to store the instance and whether it has been initialized
     _instance = None
+    _initialized = False
     
     def __new__(cls, *args, **kwargs):
         """Create a new instance if one doesn't exist.
@@ -948,18 +1308,36 @@ class Singleton:
         Args:
             value: A value to store
         """
-        # Only initialize once
-        if not hasattr(self, "initialized"):
-            self.value = value
-            self.initialized = True
+        # Only initialize once - a plain class attribute check, no hasattr()
+        cls = type(self)
+        if cls._initialized:
+            return
+        self.value = value
+        cls._initialized = True
 
 
 # Factory Pattern
 class AnimalFactory:
     """A factory class for creating animals."""
     
-    @staticmethod
-    def create_animal(animal_type, *args, **kwargs):
+    # Registry of supported animal types - one dict lookup instead of an
+    # if/elif chain, and new types can be added without editing the factory
+    _REGISTRY = {"dog": Dog, "cat": Cat}
+    
+    @classmethod
+    def register(cls, animal_type, animal_class):
+        """Register a class for an animal type.
+        
+        Args:
+            animal_type (str): The name used to request this animal
+            animal_class (type): The class to instantiate for it
+        """
+        cls._REGISTRY[animal_type] = animal_class
+        # Cached animals may have been built from the old registry
+        cls.create_animal_cached.cache_clear()
+    
+    @classmethod
+    def create_animal(cls, animal_type, *args, **kwargs):
         """Create an animal of the specified type.
         
         Args:
@@ -973,12 +1351,32 @@ class AnimalFactory:
         Raises:
             ValueError: If the animal type is not supported
         """
-        if animal_type == "dog":
-            return Dog(*args, **kwargs)
-        elif animal_type == "cat":
-            return Cat(*args, **kwargs)
-        else:
+        animal_class = cls._REGISTRY.get(animal_type)
+        if animal_class is None:
             raise ValueError(f"Unknown animal type: {animal_type}")
+        return animal_class(*args, **kwargs)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def create_animal_cached(cls, animal_type, *args):
+        """Create an animal, reusing the object from an identical earlier call.
+        
+        This is the Flyweight pattern: callers that opt in get the *same*
+        object back for the same arguments, so it must be treated as shared
+        and never modified. Up to 256 distinct argument combinations are kept;
+        the least recently used one is dropped when the cache is full.
+        
+        Args:
+            animal_type (str): The type of animal to create
+            *args: Hashable positional arguments to pass to the constructor
+            
+        Returns:
+            Animal: A (possibly shared) animal object
+            
+        Raises:
+            ValueError: If the animal type is not supported
+        """
+        return cls.create_animal(animal_type, *args)
 
 
 # Observer Pattern
@@ -986,17 +1384,38 @@ class Subject:
     """A subject that observers can subscribe to."""
     
     def __init__(self):
-        """Initialize the subject with an empty list of observers."""
-        self._observers = []
-    
-    def attach(self, observer):
+        """Initialize the subject with no observers."""
+        # Maps id(observer) to a (level, match, handler) entry. The dict works
+        # as an ordered set: attach/detach are O(1) instead of the O(n)
+        # membership test and remove() of a list, and iteration still follows
+        # attach order. Keying by id() means observers need not be hashable;
+        # the bound handler keeps the observer alive, so its id is not reused
+        # while it is attached
+        self._observers = {}
+        # Immutable copy of the entries that notify iterates. It is rebuilt
+        # on attach/detach, so observers that attach or detach during a
+        # notification do not disturb the loop, and notify never iterates
+        # a dict that is changing size
+        self._snapshot = ()
+    
+    def attach(self, observer, level=0, match=None):
         """Attach an observer to the subject.
         
+        Observers are only notified of events whose level is at least their
+        own, so an observer that only needs coarse-grained updates can attach
+        with a higher level and skip the rest. An optional match function
+        filters events further. The observer's update method is looked up
+        once here rather than on every notification. Attaching an observer
+        again replaces its level and match function.
+        
         Args:
             observer: The observer to attach
+            level (int, optional): The lowest event level the observer wants
+            match (callable, optional): Called with the notification
+                arguments; the observer is only updated when it returns True
         """
-        if observer not in self._observers:
-            self._observers.append(observer)
+        self._observers[id(observer)] = (level, match, observer.update)
+        self._snapshot = tuple(self._observers.values())
     
     def detach(self, observer):
         """Detach an observer from the subject.
@@ -1004,18 +1423,28 @@ class Subject:
         Args:
             observer: The observer to detach
         """
-        if observer in self._observers:
-            self._observers.remove(observer)
+        if self._observers.pop(id(observer), None) is not None:
+            self._snapshot = tuple(self._observers.values())
     
-    def notify(self, *args, **kwargs):
-        """Notify all observers.
+    def notify(self, *args, level=0, **kwargs):
+        """Notify the observers interested in an event of the given level.
+        
+        Observers are called from the snapshot taken at the last attach or
+        detach, so an observer may safely detach itself (or attach others)
+        from inside update(); the change applies from the next notification.
         
         Args:
             *args: Positional arguments to pass to observers
+            level (int, optional): The event level; only observers attached
+                with a level less than or equal to it are updated
             **kwargs: Keyword arguments to pass to observers
         """
-        for observer in self._observers:
-            observer.update(self, *args, **kwargs)
+        snapshot = self._snapshot
+        if not snapshot:
+            return
+        for observer_level, match, handler in snapshot:
+            if observer_level <= level and (match is None or match(*args, **kwargs)):
+                handler(self, *args, **kwargs)
 
 
 class Observer:
@@ -1033,12 +1462,21 @@ class Observer:
 
 
 class StockMarket(Subject):
-    """A stock market that observers can subscribe to."""
+    """A stock market that observers can subscribe to.
+    
+    Every price change is a level 0 event, and every summary_interval-th
+    change is also a level 1 "summary" event, so observers attached with
+    level=1 hear about the price only occasionally.
+    """
+    
+    # Number of ticks between summary (level 1) notifications
+    summary_interval = 10
     
     def __init__(self):
         """Initialize the stock market with a price."""
         super().__init__()
         self._price = 0
+        self._ticks = 0
     
     @property
     def price(self):
@@ -1057,19 +1495,50 @@ class StockMarket(Subject):
             value (float): The new price
         """
         self._price = value
-        self.notify(value)
+        self._ticks += 1
+        # Only build the notification when someone is listening
+        if self._snapshot:
+            level = 1 if self._ticks % self.summary_interval == 0 else 0
+            self.notify(value, level=level)
 
 
 class Investor(Observer):
     """An investor that observes a stock market."""
     
-    def __init__(self, name):
+    def __init__(self, name, threshold=None):
         """Initialize the investor with a name.
         
         Args:
             name (str): The investor's name
+            threshold (float, optional): Only prices at or above this are of
+                interest; None means every price
         """
         self.name = name
+        self.threshold = threshold
+    
+    def watch(self, market, level=0):
+        """Start observing a stock market.
+        
+        With a threshold set, the market filters out lower prices before
+        calling update().
+        
+        Args:
+            market (StockMarket): The market to observe
+            level (int, optional): The lowest event level of interest
+        """
+        match = None if self.threshold is None else self.is_interested
+        market.attach(self, level=level, match=match)
+    
+    def is_interested(self, price, *args, **kwargs):
+        """Check whether a price reaches the investor's threshold.
+        
+        Args:
+            price (float): The new price
+            
+        Returns:
+            bool: True if the price is at or above the threshold
+        """
+        return price >= self.threshold
     
     def update(self, subject, *args, **kwargs):
         """Update the investor.
@@ -8,6 +8,25 @@ class Person:
     def __repr__(self):
         return f"Person(name={self.name}, address={self.address})"
 
+    # copy.copy()/copy.deepcopy() normally go through __reduce_ex__; these
+    # build the copy directly. type(self) keeps subclasses their own type,
+    # and copying __dict__ keeps attributes set after __init__
+    def __copy__(self):
+        # Shallow copy: a new Person that shares the same Address object
+        cls = type(self)
+        result = cls.__new__(cls)
+        result.__dict__.update(self.__dict__)
+        return result
+
+    def __deepcopy__(self, memo):
+        # Deep copy: the Address is copied too (memo keeps shared objects shared)
+        cls = type(self)
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        for name, value in self.__dict__.items():
+            setattr(result, name, copy.deepcopy(value, memo))
+        return result
+
 class Address:
     def __init__(self, city, country):
         self.city = city
@@ -16,6 +35,22 @@ class Address:
     def __repr__(self):
         return f"Address(city={self.city}, country={self.country})"
 
+    def __copy__(self):
+        cls = type(self)
+        result = cls.__new__(cls)
+        result.__dict__.update(self.__dict__)
+        return result
+
+    def __deepcopy__(self, memo):
+        # deepcopy returns immutable values such as the city and country
+        # strings as they are, so only mutable attributes get copied
+        cls = type(self)
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        for name, value in self.__dict__.items():
+            setattr(result, name, copy.deepcopy(value, memo))
+        return result
+
 # Create a person with an address
 address = Address("New York", "USA")
 person = Person("John", address)
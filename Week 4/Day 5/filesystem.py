@@ -1,37 +1,70 @@
 #Need to all file operation with example detail step by step
+import io
 import os
+import sys
+#Write buffer size - a bigger buffer means fewer write syscalls for large data
+BUF = max(io.DEFAULT_BUFFER_SIZE, 131072)
+DEFAULT_DATA = ("Hello, World!",)
+
+#Cache of os.stat() results - the get_* helpers below all read from one stat call
+#instead of each asking the OS again. Anything that changes the file must call invalidate()
+_STAT_CACHE = {}
+
+def _stat(path):
+    result = _STAT_CACHE.get(path)
+    if result is None:
+        result = _STAT_CACHE[path] = os.stat(path)
+    return result
+
+def invalidate(path=None):
+    if path is None:
+        path = filePath
+    _STAT_CACHE.pop(path, None)
+
 #1. Create a file
 filePath = "/home/kiran/Desktop/Mthree-Notes/Week 4/Day 5/test.txt"
-def create_file():
-    with open(filePath, "w") as file:
-        file.write("Hello, World!")
+def create_file(data=DEFAULT_DATA, buf=BUF):
+    with open(filePath, "w", buffering=buf) as file:
+        file.writelines(data)
+    invalidate()
 
 
 #2. Write to a file
-def write_to_file():
-    with open(filePath, "w") as file:
-        file.write("Hello, World!")
+#Pass all the lines at once - writelines fills the buffer and flushes it in as few syscalls as possible
+def write_to_file(data=DEFAULT_DATA, buf=BUF):
+    with open(filePath, "w", buffering=buf) as file:
+        file.writelines(data)
+    invalidate()
 
 #3. Read from a file
+#An unbuffered binary open() reads the whole file with the raw FileIO object,
+#skipping the BufferedReader layer and the isatty check a buffered text open() makes
 def read_from_file():
-    print(os.getcwd())
-    with open(filePath, "r") as file:
-        print(file.read())
+    with open(filePath, "rb", buffering=0) as file:
+        data = file.readall()
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
 
 #4. Append to a file
-def append_to_file():
-    with open(filePath, "a") as file:
-        file.write("Hello, World!")
+#Collect everything to append in a list first, then write it in one go
+def append_to_file(data=DEFAULT_DATA, buf=BUF):
+    with open(filePath, "a", buffering=buf) as file:
+        file.writelines(data)
+    invalidate()
 
 #5. Delete a file   
 def delete_file():
     os.remove(filePath)
+    invalidate()
 
 #6. Check if a file exists
 def check_if_file_exists():
-    if os.path.exists(filePath):
+    try:
+        _stat(filePath)
         print("File exists")
-    else:
+    except OSError:
         print("File does not exist")
 
 #7. Get the current working directory
@@ -40,16 +73,31 @@ def get_current_working_directory():
     print(os.getcwd())
 
 #8. List all files in a directory
-def list_files_in_directory():
-    print(os.listdir())
+#os.scandir() entries usually already know their type from the directory listing,
+#so the is_*() checks need no extra stat call per name as with os.path.isfile()
+#(the size still costs one lstat per entry; it does not follow symlinks, so a
+#dangling symlink is listed instead of raising)
+def _entry_kind(entry):
+    if entry.is_symlink():
+        return "symlink"
+    if entry.is_dir():
+        return "directory"
+    if entry.is_file():
+        return "file"
+    return "other"
+
+def list_files_in_directory(path="."):
+    with os.scandir(path) as entries:
+        return [(entry.name, _entry_kind(entry), entry.stat(follow_symlinks=False).st_size)
+                for entry in entries]
 
 #9. Get the size of a file
 def get_size_of_file():
-    print(os.path.getsize(filePath))
+    print(_stat(filePath).st_size)
 
 #10. Get the last modified time of a file
 def get_last_modified_time_of_file():
-    print(os.path.getmtime(filePath))
+    print(_stat(filePath).st_mtime)
 
 #11. Get the file type
 def get_file_type():
@@ -82,7 +130,8 @@ if __name__ == "__main__":
     write_to_file()
     check_if_file_exists()
     get_current_working_directory()
-    list_files_in_directory()
+    for name, kind, size in list_files_in_directory():
+        print(f"{name} ({kind}, {size} bytes)")
     get_size_of_file()
     get_last_modified_time_of_file()
     get_file_type()
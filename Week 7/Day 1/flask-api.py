@@ -1,16 +1,26 @@
 import os
 import time
 import logging
+import mmap
+import threading
 from flask import Flask, jsonify, request
-from flask_cors import CORS
-from prometheus_client import Counter, Histogram, generate_latest, REGISTRY, CONTENT_TYPE_LATEST
+from prometheus_client import (Counter, Histogram, CollectorRegistry, generate_latest, multiprocess,
+                               REGISTRY, CONTENT_TYPE_LATEST)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+
+# CORS headers added to every response (allowing any origin, as
+# flask-cors' CORS(app) did), set in after_request. Preflight requests are
+# answered by Flask's automatic OPTIONS response, which gets them too
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
 
 # Define Prometheus metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total number of requests by endpoint and method', 
@@ -18,6 +28,45 @@ REQUEST_COUNT = Counter('http_requests_total', 'Total number of requests by endp
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'Request latency in seconds',
                          ['method', 'endpoint'])
 
+# Requests seen since the last flush, keyed by (method, endpoint, status) and
+# holding each request's latency. after_request only appends here; the
+# Prometheus metrics (and their locks) are updated in batches by _flush_metrics
+METRICS_FLUSH_INTERVAL = 1.0
+_pending = {}
+_pending_lock = threading.Lock()
+
+# Labelled metric children, kept after their first use so each flush is a
+# dict lookup instead of a .labels() call (which locks and hashes the labels)
+_count_children = {}
+_latency_children = {}
+
+def _flush_metrics():
+    """Move the pending request counts and latencies into the Prometheus metrics"""
+    global _pending
+    with _pending_lock:
+        pending, _pending = _pending, {}
+    
+    for key, latencies in pending.items():
+        request_counter = _count_children.get(key)
+        if request_counter is None:
+            request_counter = _count_children[key] = REQUEST_COUNT.labels(*key)
+        request_counter.inc(len(latencies))
+        
+        # Histogram buckets need every observation, not just their sum
+        latency_key = key[:2]
+        latency_histogram = _latency_children.get(latency_key)
+        if latency_histogram is None:
+            latency_histogram = _latency_children[latency_key] = REQUEST_LATENCY.labels(*latency_key)
+        for latency in latencies:
+            latency_histogram.observe(latency)
+
+def _flush_metrics_forever():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        _flush_metrics()
+
+threading.Thread(target=_flush_metrics_forever, name='metrics-flusher', daemon=True).start()
+
 # Sample data
 system_metrics = {
     'cpu_usage': 30.5,
@@ -35,6 +84,57 @@ alerts = [
     {'id': 3, 'severity': 'info', 'message': 'System update available', 'timestamp': '2025-03-20T09:15:00Z'}
 ]
 
+# JSON bodies that do not change while the process runs are encoded once, on
+# first use, instead of on every request. app.json.response is what jsonify
+# uses, and encoding during a request (once app.run has set app.debug, which
+# makes jsonify pretty-print) gives bytes identical to a jsonify response
+def _json_bytes(obj):
+    return app.json.response(obj).get_data()
+
+def _json_response(body):
+    # A fresh response per request: the after_request hooks add headers to it
+    return app.response_class(body, mimetype='application/json')
+
+_json_cache = {}
+
+def _cached_json_response(key, obj):
+    body = _json_cache.get(key)
+    if body is None:
+        body = _json_cache[key] = _json_bytes(obj)
+    return _json_response(body)
+
+_HEALTH = {'status': 'healthy', 'version': '1.0.0'}
+
+_CONFIG = {
+    'app_name': 'SRE Demo API',
+    'environment': os.environ.get('ENVIRONMENT', 'development'),
+    'log_level': os.environ.get('LOG_LEVEL', 'INFO'),
+    'metrics_enabled': True,
+    'version': '1.0.0'
+}
+
+# /api/alerts results for each severity
+_ALERTS_BY_SEVERITY = {
+    severity: [alert for alert in alerts if alert['severity'] == severity]
+    for severity in {alert['severity'] for alert in alerts}
+}
+
+# system_metrics may be updated while running, so its encoding is only
+# reused for METRICS_CACHE_TTL seconds: (monotonic time encoded, bytes)
+METRICS_CACHE_TTL = 1.0
+_metrics_cache = (float('-inf'), b'')
+
+def _cpu_burn(n):
+    """Busy-work for the CPU load simulation: sum of squares below n.
+    
+    Keeps the CPU busy with arithmetic without building a throwaway list
+    (and the matching allocation/GC work) on every pass.
+    """
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
 # Middleware to record metrics
 @app.before_request
 def before_request():
@@ -43,23 +143,45 @@ def before_request():
 @app.after_request
 def after_request(response):
     request_latency = time.time() - request.start_time
-    REQUEST_LATENCY.labels(request.method, request.path).observe(request_latency)
-    REQUEST_COUNT.labels(request.method, request.path, response.status_code).inc()
+    key = (request.method, request.path, response.status_code)
+    with _pending_lock:
+        latencies = _pending.get(key)
+        if latencies is None:
+            _pending[key] = [request_latency]
+        else:
+            latencies.append(request_latency)
+    response.headers.update(CORS_HEADERS)
     return response
 
 @app.route('/metrics')
 def metrics():
-    return generate_latest(REGISTRY), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    # Include everything this process recorded so far, not just what the last
+    # flush saw (other Gunicorn workers flush theirs within METRICS_FLUSH_INTERVAL)
+    _flush_metrics()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        # Under Gunicorn (see gunicorn.conf.py) report the metrics of all
+        # workers combined, not only those of the worker serving this scrape
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
 @app.route('/api/health')
 def health_check():
     logger.info('Health check endpoint accessed')
-    return jsonify({'status': 'healthy', 'version': '1.0.0'})
+    return _cached_json_response('health', _HEALTH)
 
 @app.route('/api/metrics')
 def get_metrics():
+    global _metrics_cache
     logger.info('Metrics endpoint accessed')
-    return jsonify(system_metrics)
+    now = time.monotonic()
+    encoded_at, body = _metrics_cache
+    if now - encoded_at > METRICS_CACHE_TTL:
+        body = _json_bytes(system_metrics)
+        _metrics_cache = (now, body)
+    return _json_response(body)
 
 @app.route('/api/alerts')
 def get_alerts():
@@ -67,22 +189,18 @@ def get_alerts():
     severity = request.args.get('severity')
     
     if severity:
-        filtered_alerts = [alert for alert in alerts if alert['severity'] == severity]
-        return jsonify(filtered_alerts)
+        # Unknown severities share the cached empty list
+        matching = _ALERTS_BY_SEVERITY.get(severity)
+        if matching is None:
+            return _cached_json_response(('alerts', None), [])
+        return _cached_json_response(('alerts', severity), matching)
     
-    return jsonify(alerts)
+    return _cached_json_response('alerts', alerts)
 
 @app.route('/api/config')
 def get_config():
     logger.info('Config endpoint accessed')
-    config = {
-        'app_name': 'SRE Demo API',
-        'environment': os.environ.get('ENVIRONMENT', 'development'),
-        'log_level': os.environ.get('LOG_LEVEL', 'INFO'),
-        'metrics_enabled': True,
-        'version': '1.0.0'
-    }
-    return jsonify(config)
+    return _cached_json_response('config', _CONFIG)
 
 @app.route('/api/simulate/cpu')
 def simulate_cpu_load():
@@ -93,7 +211,7 @@ def simulate_cpu_load():
     # Simple CPU-bound task
     start_time = time.time()
     while time.time() - start_time < duration:
-        _ = [i**2 for i in range(10000)]
+        _cpu_burn(10000)
     
     return jsonify({'status': 'success', 'message': f'CPU load simulated for {duration} seconds'})
 
@@ -104,13 +222,22 @@ def simulate_memory_load():
     size_mb = int(request.args.get('size_mb', 10))
     duration = int(request.args.get('duration', 5))
     
-    # Allocate memory
-    data = bytearray(size_mb * 1024 * 1024)
+    # Allocate memory as an anonymous mapping and write one byte per page,
+    # which is enough for the kernel to commit it, instead of zero-filling
+    # every byte the way bytearray() does
+    size = size_mb * 1024 * 1024
+    data = mmap.mmap(-1, size or 1, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    try:
+        for offset in range(0, size, mmap.PAGESIZE):
+            data[offset] = 1
+        
+        # Hold for duration (under Gunicorn's gevent worker time.sleep is
+        # monkey-patched and lets the worker serve other requests meanwhile)
+        time.sleep(duration)
+    finally:
+        # Give the memory back to the OS straight away
+        data.close()
     
-    # Hold for duration
-    time.sleep(duration)
-    
-    # Memory is automatically freed when function returns
     return jsonify({'status': 'success', 'message': f'Memory load simulated: {size_mb}MB for {duration} seconds'})
 
 @app.route('/api/simulate/error')
@@ -128,8 +255,17 @@ if __name__ == '__main__':
     # Get port from environment or default to 5000
     port = int(os.environ.get('PORT', 5000))
     
-    # Debug mode should be disabled in production
-    debug_mode = os.environ.get('ENVIRONMENT', 'development') == 'development'
-    
-    logger.info(f'Starting Flask API on port {port}')
-    app.run(host='0.0.0.0', port=port, debug=debug_mode)
+    # The Flask development server handles one request at a time and has
+    # debug mode on, so only use it in development
+    if os.environ.get('ENVIRONMENT', 'development') == 'development':
+        logger.info(f'Starting Flask API on port {port}')
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # Everywhere else, hand over to Gunicorn (see gunicorn.conf.py). The
+        # module name and config path come from this file's location, so this
+        # works for flask-api.py here as well as app.py in the Docker image
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        module = os.path.splitext(os.path.basename(__file__))[0]
+        logger.info(f'Starting Flask API with Gunicorn on port {port}')
+        os.execvp('gunicorn', ['gunicorn', '-c', os.path.join(app_dir, 'gunicorn.conf.py'),
+                               '--chdir', app_dir, f'{module}:app'])
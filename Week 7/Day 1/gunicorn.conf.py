@@ -0,0 +1,54 @@
+# Gunicorn configuration for the Flask API
+# Used by the Dockerfile: gunicorn -c gunicorn.conf.py app:app
+import glob
+import multiprocessing
+import os
+import tempfile
+
+# Listen on the same port the development server used
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# (2 x CPU) + 1 worker processes, so requests are handled in parallel
+# instead of one at a time; override with GUNICORN_WORKERS
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# gevent workers run each request in a greenlet, so requests that mostly
+# wait (sleeping, logging, network) share a worker by the thousand instead of
+# pinning it. Gunicorn monkey-patches the standard library before loading the
+# app, so time.sleep and socket I/O already yield to other requests.
+# Set GUNICORN_WORKER_CLASS=gthread when CPU-bound requests (/api/simulate/cpu)
+# matter more, since a greenlet that never waits blocks its whole worker.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Threads per worker, only used by the gthread worker class
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Each worker process keeps its own Prometheus metrics, so a scrape would only
+# see whichever worker answered it. In prometheus_client's multiprocess mode
+# every worker writes its metrics to *.db files in PROMETHEUS_MULTIPROC_DIR
+# and /metrics adds them all up. on_starting runs once in the Gunicorn master
+# before any worker imports the app (and not again on a SIGHUP reload, when
+# old workers are still writing), so the workers inherit the variable.
+def on_starting(server):
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir is None:
+        # A fresh directory of our own, starting empty
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='prometheus-multiproc-')
+        return
+    # A directory chosen by the operator may hold other files, so only remove
+    # the metric files a previous run left there, which would be counted again
+    os.makedirs(multiproc_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(multiproc_dir, '*.db')):
+        os.remove(path)
+
+def child_exit(server, worker):
+    # Drop the live gauges of a worker that has exited (its counters and
+    # histograms are kept, so totals do not go backwards)
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+# Log requests and errors to stdout/stderr so `kubectl logs` shows them
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get('LOG_LEVEL', 'INFO').lower()
@@ -6,9 +6,13 @@ Deploys the React SRE app to Minikube with proper monitoring.
 """
 
 import argparse
+import concurrent.futures
+import contextlib
+import json
 import os
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 
@@ -20,22 +24,36 @@ MONITORING_DIR = os.path.join(PROJECT_ROOT, "monitoring")
 DEPLOY_TIMEOUT = 300  # 5 minutes
 KUBECTL_CMD = "kubectl"  # Use kubectl instead of kubectly
 
-def log(level, message):
-    """Log messages with timestamp and level."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    levels = {
+# Set when the deployment is being abandoned (a failed build or Ctrl+C), so
+# stages still running on worker threads stop retrying and waiting
+_cancelled = threading.Event()
+
+# Colored "[LEVEL]" prefixes for log(), built once instead of on every call
+_RESET = "\033[0m"
+_LOG_PREFIXES = {
+    level: f"{color}[{level}]{_RESET}"
+    for level, color in {
         "INFO": "\033[92m",  # Green
         "WARN": "\033[93m",  # Yellow
         "ERROR": "\033[91m",  # Red
         "DEBUG": "\033[94m",  # Blue
-    }
-    
-    color = levels.get(level, "\033[0m")
-    reset = "\033[0m"
-    print(f"{color}[{level}]{reset} {timestamp} - {message}")
+    }.items()
+}
 
-def run_command(command, timeout=60, retry=1, shell=False, cwd = None):
-    """Run a shell command with timeout and retry logic."""
+def log(level, message):
+    """Log messages with timestamp and level."""
+    prefix = _LOG_PREFIXES.get(level) or f"{_RESET}[{level}]{_RESET}"
+    # One write per line, so lines logged from different threads do not interleave
+    sys.stdout.write(f"{prefix} {datetime.now():%Y-%m-%d %H:%M:%S} - {message}\n")
+
+def run_command(command, timeout=60, retry=1, shell=False, cwd = None, capture=True):
+    """Run a shell command with timeout and retry logic.
+    
+    With capture=False stdout is discarded instead of read into memory
+    (stderr is still kept for the failure message) and an empty string is
+    returned on success; use it when only success or failure matters.
+    """
+    stdout = subprocess.PIPE if capture else subprocess.DEVNULL
     for attempt in range(retry):
         try:
             log("DEBUG", f"Running command: {command if shell else ' '.join(command)}")
@@ -43,7 +61,7 @@ def run_command(command, timeout=60, retry=1, shell=False, cwd = None):
             if shell:
                 result = subprocess.run(
                     command,
-                    stdout=subprocess.PIPE,
+                    stdout=stdout,
                     stderr=subprocess.PIPE,
                     text=True,
                     timeout=timeout,
@@ -53,7 +71,7 @@ def run_command(command, timeout=60, retry=1, shell=False, cwd = None):
             else:
                 result = subprocess.run(
                     command,
-                    stdout=subprocess.PIPE,
+                    stdout=stdout,
                     stderr=subprocess.PIPE,
                     text=True,
                     timeout=timeout,
@@ -61,15 +79,15 @@ def run_command(command, timeout=60, retry=1, shell=False, cwd = None):
                 )
             
             if result.returncode == 0:
-                return result.stdout.strip()
+                return result.stdout.strip() if capture else ""
             else:
                 log("WARN", f"Command failed (attempt {attempt+1}/{retry}): {result.stderr}")
-                if attempt < retry - 1:
-                    time.sleep(5)
+                if attempt < retry - 1 and _cancelled.wait(5):
+                    break
         except subprocess.TimeoutExpired:
             log("WARN", f"Command timed out after {timeout}s (attempt {attempt+1}/{retry})")
-            if attempt < retry - 1:
-                time.sleep(5)
+            if attempt < retry - 1 and _cancelled.wait(5):
+                break
     
     log("ERROR", f"Command failed after {retry} attempts: {command if shell else ' '.join(command)}")
     return None
@@ -80,7 +98,6 @@ def check_minikube_status():
     
     if status:
         try:
-            import json
             status_json = json.loads(status)
             return status_json.get("Host", "") == "Running"
         except json.JSONDecodeError:
@@ -88,6 +105,56 @@ def check_minikube_status():
     
     return False
 
+def wait_for_pods(namespace, selector, timeout=DEPLOY_TIMEOUT):
+    """Wait until the pods matching a label selector are Ready.
+    
+    kubectl wait watches the pods and returns as soon as they are Ready,
+    instead of polling their status. It fails straight away while no pod
+    matches yet (e.g. just after an apply), so it is retried until the
+    timeout runs out. Gives up early, returning False, once the deployment
+    is cancelled.
+    """
+    deadline = time.monotonic() + timeout
+    while not _cancelled.is_set():
+        remaining = int(deadline - time.monotonic())
+        if remaining <= 0:
+            return False
+        
+        # Run kubectl directly rather than through run_command: a failure here
+        # is usually just "no matching resources" during a normal rollout and
+        # should not be logged as an error on every retry
+        command = [KUBECTL_CMD, "wait", "--for=condition=Ready", "pod", "-l", selector,
+                   "-n", namespace, f"--timeout={remaining}s"]
+        log("DEBUG", f"Running command: {' '.join(command)}")
+        # Check for cancellation every second instead of blocking until
+        # kubectl returns, which can take the whole remaining timeout
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        while True:
+            try:
+                _, stderr = process.communicate(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                if _cancelled.is_set() or time.monotonic() > deadline + 10:
+                    process.kill()
+                    process.communicate()
+                    return False
+        
+        if process.returncode == 0:
+            return True
+        
+        if "no matching resources" in stderr:
+            log("INFO", f"Waiting for pods {selector} in {namespace} to be created...")
+        else:
+            log("WARN", f"Waiting for pods {selector} in {namespace}: {stderr.strip()}")
+        _cancelled.wait(5)
+    
+    return False
+
 def build_react_app():
     """Build the React application."""
     log("INFO", "Building React application...")
@@ -98,14 +165,14 @@ def build_react_app():
     
     # Install dependencies
     log("INFO", "Installing npm dependencies...")
-    result = run_command(["npm", "install", "--legacy-peer-deps"], timeout=300, cwd=REACT_APP_DIR)
+    result = run_command(["npm", "install", "--legacy-peer-deps"], timeout=300, cwd=REACT_APP_DIR, capture=False)
     if result is None:
         log("ERROR", "Failed to install npm dependencies")
         return False
     
     # Build the app
     log("INFO", "Building React application...")
-    result = run_command(["npm", "run", "build"], timeout=300, cwd=REACT_APP_DIR)
+    result = run_command(["npm", "run", "build"], timeout=300, cwd=REACT_APP_DIR, capture=False)
     if result is None:
         log("ERROR", "Failed to build React application")
         return False
@@ -125,7 +192,8 @@ def build_docker_image():
     result = run_command(
         ["docker", "build", "-t", "react-sre-app:latest", "."],
         timeout=300,
-        cwd=REACT_APP_DIR
+        cwd=REACT_APP_DIR,
+        capture=False
     )
     if result is None:
         log("ERROR", "Failed to build Docker image")
@@ -135,7 +203,8 @@ def build_docker_image():
     log("INFO", "Loading Docker image into Minikube...")
     result = run_command(
         ["minikube", "image", "load", "react-sre-app:latest"],
-        timeout=120
+        timeout=120,
+        capture=False
     )
     if result is None:
         log("ERROR", "Failed to load Docker image into Minikube")
@@ -144,6 +213,10 @@ def build_docker_image():
     log("INFO", "Docker image built and loaded successfully")
     return True
 
+def build_app():
+    """Build the React application and its Docker image, in that order."""
+    return build_react_app() and build_docker_image()
+
 # def create_namespaces():
 #     """Create necessary Kubernetes namespaces."""
 #     log("INFO", "Creating Kubernetes namespaces...")
@@ -201,38 +274,38 @@ def build_docker_image():
 #     log("INFO", "Kubernetes namespaces created successfully")
 #     return True
 
+NAMESPACE_YAML = """apiVersion: v1
+kind: Namespace
+metadata:
+  name: {name}
+"""
+
 def create_namespaces():
     """Create necessary Kubernetes namespaces."""
     log("INFO", "Creating Kubernetes namespaces...")
     
+    # Write the namespace manifests directly (the same YAML
+    # `kubectl create namespace --dry-run=client` produced) and apply all
+    # of them with a single kubectl call
     namespaces = ["react-sre-app", "monitoring"]
-    for namespace in namespaces:
-        # Step 1: Generate namespace YAML
-        result = run_command(
-            [KUBECTL_CMD, "create", "namespace", namespace, "--dry-run=client", "-o", "yaml"],
-            timeout=10
+    namespaces_yaml = "---\n".join(NAMESPACE_YAML.format(name=namespace) for namespace in namespaces)
+    
+    try:
+        log("DEBUG", f"Applying namespace YAML for {', '.join(namespaces)}")
+        apply_proc = subprocess.run(
+            [KUBECTL_CMD, "apply", "-f", "-"],
+            input=namespaces_yaml,
+            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=30
         )
-        if result is None:
-            log("ERROR", f"Failed to generate namespace YAML for {namespace}")
-            return False
-
-        # Step 2: Apply it using subprocess directly, feeding YAML to stdin
-        try:
-            log("DEBUG", f"Applying namespace YAML for {namespace}")
-            apply_proc = subprocess.run(
-                [KUBECTL_CMD, "apply", "-f", "-"],
-                input=result,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30
-            )
-            if apply_proc.returncode != 0:
-                log("ERROR", f"Failed to create namespace {namespace}: {apply_proc.stderr}")
-                return False
-        except subprocess.TimeoutExpired:
-            log("ERROR", f"Timeout while applying namespace {namespace}")
+        if apply_proc.returncode != 0:
+            log("ERROR", f"Failed to create namespaces: {apply_proc.stderr}")
             return False
+    except subprocess.TimeoutExpired:
+        log("ERROR", "Timeout while applying namespaces")
+        return False
 
     log("INFO", "Kubernetes namespaces created successfully")
     return True
@@ -251,12 +324,16 @@ def deploy_monitoring():
     result = run_command(
         [KUBECTL_CMD, "apply", "-f", prometheus_yaml],
         timeout=30,
-        retry=3
+        retry=3,
+        capture=False
     )
     if result is None:
         log("ERROR", "Failed to deploy Prometheus")
         return False
     
+    if _cancelled.is_set():
+        return False
+    
     # Deploy Grafana
     log("INFO", "Deploying Grafana...")
     grafana_yaml = os.path.join(MONITORING_DIR, "grafana-k8s.yaml")
@@ -267,44 +344,33 @@ def deploy_monitoring():
     result = run_command(
         [KUBECTL_CMD, "apply", "-f", grafana_yaml],
         timeout=30,
-        retry=3
+        retry=3,
+        capture=False
     )
     if result is None:
         log("ERROR", "Failed to deploy Grafana")
         return False
     
-    # Wait for Prometheus and Grafana to be ready
+    # Wait for Prometheus and Grafana to be ready, both at once
     log("INFO", "Waiting for monitoring stack to be ready...")
-    start_time = time.time()
-    prometheus_ready = False
-    grafana_ready = False
-    
-    while time.time() - start_time < DEPLOY_TIMEOUT:
-        if not prometheus_ready:
-            prom_status = run_command(
-                [KUBECTL_CMD, "get", "pods", "-n", "monitoring", "-l", "app=prometheus", "-o", "jsonpath='{.items[0].status.phase}'"],
-                timeout=10
-            )
-            if prom_status and "Running" in prom_status:
-                prometheus_ready = True
-                log("INFO", "Prometheus is ready")
-        
-        if not grafana_ready:
-            graf_status = run_command(
-                [KUBECTL_CMD, "get", "pods", "-n", "monitoring", "-l", "app=grafana", "-o", "jsonpath='{.items[0].status.phase}'"],
-                timeout=10
-            )
-            if graf_status and "Running" in graf_status:
-                grafana_ready = True
-                log("INFO", "Grafana is ready")
-        
-        if prometheus_ready and grafana_ready:
-            log("INFO", "Monitoring stack deployed successfully")
-            return True
-        
-        elapsed = int(time.time() - start_time)
-        log("INFO", f"Waiting for monitoring stack... ({elapsed}s elapsed)")
-        time.sleep(10)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        prometheus = executor.submit(wait_for_pods, "monitoring", "app=prometheus")
+        grafana = executor.submit(wait_for_pods, "monitoring", "app=grafana")
+        prometheus_ready = prometheus.result()
+        grafana_ready = grafana.result()
+    
+    if prometheus_ready:
+        log("INFO", "Prometheus is ready")
+    if grafana_ready:
+        log("INFO", "Grafana is ready")
+    
+    if prometheus_ready and grafana_ready:
+        log("INFO", "Monitoring stack deployed successfully")
+        return True
+    
+    if _cancelled.is_set():
+        log("WARN", "Monitoring stack deployment cancelled")
+        return False
     
     log("ERROR", f"Monitoring stack deployment timed out after {DEPLOY_TIMEOUT}s")
     return False
@@ -322,7 +388,8 @@ def deploy_application(env="dev"):
     result = run_command(
         [KUBECTL_CMD, "apply", "-k", kustomize_dir],
         timeout=60,
-        retry=3
+        retry=3,
+        capture=False
     )
     if result is None:
         log("ERROR", f"Failed to deploy application to {env} environment")
@@ -330,20 +397,9 @@ def deploy_application(env="dev"):
     
     # Wait for application to be ready
     log("INFO", "Waiting for application to be ready...")
-    start_time = time.time()
-    while time.time() - start_time < DEPLOY_TIMEOUT:
-        app_status = run_command(
-            [KUBECTL_CMD, "get", "pods", "-n", "react-sre-app", "-l", f"app=react-sre-app", "-o", "jsonpath='{.items[*].status.phase}'"],
-            timeout=10
-        )
-        
-        if app_status and "Running" in app_status and "Pending" not in app_status:
-            log("INFO", "Application is ready")
-            return True
-        
-        elapsed = int(time.time() - start_time)
-        log("INFO", f"Waiting for application... ({elapsed}s elapsed)")
-        time.sleep(10)
+    if wait_for_pods("react-sre-app", "app=react-sre-app"):
+        log("INFO", "Application is ready")
+        return True
     
     log("ERROR", f"Application deployment timed out after {DEPLOY_TIMEOUT}s")
     return False
@@ -352,41 +408,36 @@ def setup_port_forwarding():
     """Set up port forwarding for the application and monitoring tools."""
     log("INFO", "Setting up port forwarding...")
     
-    # Port forward for React app
-    app_forward = subprocess.Popen(
-        [KUBECTL_CMD, "port-forward", "svc/dev-react-sre-app", "3000:80", "-n", "react-sre-app"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    # Port forward for Prometheus
-    prom_forward = subprocess.Popen(
-        [KUBECTL_CMD, "port-forward", "svc/prometheus", "9090:9090", "-n", "monitoring"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    # Port forward for Grafana
-    graf_forward = subprocess.Popen(
-        [KUBECTL_CMD, "port-forward", "svc/grafana", "8081:3000", "-n", "monitoring"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    log("INFO", "Port forwarding set up successfully")
-    log("INFO", "Application available at http://localhost:3000")
-    log("INFO", "Prometheus available at http://localhost:9090")
-    log("INFO", "Grafana available at http://localhost:8081 (admin/admin)")
-    
-    try:
-        log("INFO", "Press Ctrl+C to stop port forwarding")
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        log("INFO", "Stopping port forwarding...")
-        app_forward.terminate()
-        prom_forward.terminate()
-        graf_forward.terminate()
+    forwards = [
+        ("svc/dev-react-sre-app", "3000:80", "react-sre-app"),  # React app
+        ("svc/prometheus", "9090:9090", "monitoring"),  # Prometheus
+        ("svc/grafana", "8081:3000", "monitoring"),  # Grafana
+    ]
+    
+    # The ExitStack terminates and reaps every port-forward that was started,
+    # however this block is left (Ctrl+C, an error starting a later one, ...)
+    with contextlib.ExitStack() as stack:
+        for service, ports, namespace in forwards:
+            forward = stack.enter_context(subprocess.Popen(
+                [KUBECTL_CMD, "port-forward", service, ports, "-n", namespace],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True
+            ))
+            stack.callback(forward.terminate)
+        
+        log("INFO", "Port forwarding set up successfully")
+        log("INFO", "Application available at http://localhost:3000")
+        log("INFO", "Prometheus available at http://localhost:9090")
+        log("INFO", "Grafana available at http://localhost:8081 (admin/admin)")
+        
+        try:
+            log("INFO", "Press Ctrl+C to stop port forwarding")
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            log("INFO", "Stopping port forwarding...")
 
 def main():
     """Main function to parse arguments and execute deployment."""
@@ -414,17 +465,32 @@ def main():
     if not create_namespaces():
         return False
     
-    # Build React app and Docker image
-    if not args.skip_build:
-        if not build_react_app():
-            return False
-        if not build_docker_image():
-            return False
-    
-    # Deploy monitoring stack
-    if not args.skip_monitoring:
-        if not deploy_monitoring():
+    # Build the React app and Docker image while the monitoring stack deploys;
+    # neither depends on the other, so the slow npm/docker steps overlap with
+    # waiting for Prometheus and Grafana to come up
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    try:
+        build = None if args.skip_build else executor.submit(build_app)
+        monitoring = None if args.skip_monitoring else executor.submit(deploy_monitoring)
+        
+        # A failed build ends the deployment, so stop the monitoring stage
+        # instead of waiting for its pods
+        build_ok = build is None or build.result()
+        if not build_ok:
+            _cancelled.set()
+        elif monitoring is not None and not monitoring.result():
             success = False
+    except KeyboardInterrupt:
+        # Let the worker threads wind down instead of waiting for their
+        # retries and pod waits to run out
+        _cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    # Returns quickly once cancelled: the monitoring stage checks _cancelled
+    executor.shutdown(cancel_futures=True)
+    
+    if not build_ok:
+        return False
     
     # Deploy application
     if not deploy_application(args.env):
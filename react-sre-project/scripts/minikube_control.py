@@ -6,6 +6,7 @@ Handles starting, stopping, and checking Minikube status with proper error handl
 """
 
 import argparse
+import json
 import os
 import subprocess
 import sys
@@ -15,20 +16,25 @@ from datetime import datetime
 # Set constants
 MINIKUBE_WAIT_TIMEOUT = 60  # Seconds to wait for Minikube operations
 KUBECTL_CMD = "kubectl"  # Use kubectl instead of kubectly
+VERBOSE = os.environ.get("VERBOSE", "") not in ("", "0")  # Log command output too
 
-def log(level, message):
-    """Log messages with timestamp and level."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    levels = {
+# Colored "[LEVEL]" prefixes for log(), built once instead of on every call
+_RESET = "\033[0m"
+_LOG_PREFIXES = {
+    level: f"{color}[{level}]{_RESET}"
+    for level, color in {
         "INFO": "\033[92m",  # Green
         "WARN": "\033[93m",  # Yellow
         "ERROR": "\033[91m",  # Red
         "DEBUG": "\033[94m",  # Blue
-    }
-    
-    color = levels.get(level, "\033[0m")
-    reset = "\033[0m"
-    print(f"{color}[{level}]{reset} {timestamp} - {message}")
+    }.items()
+}
+
+def log(level, message):
+    """Log messages with timestamp and level."""
+    prefix = _LOG_PREFIXES.get(level) or f"{_RESET}[{level}]{_RESET}"
+    # One write per line, so lines logged from different threads do not interleave
+    sys.stdout.write(f"{prefix} {datetime.now():%Y-%m-%d %H:%M:%S} - {message}\n")
 
 def run_command(command, timeout=60, retry=3):
     """Run a shell command with timeout and retry logic."""
@@ -42,7 +48,8 @@ def run_command(command, timeout=60, retry=3):
                 text=True,
                 timeout=timeout
             )
-            print(result.stdout)
+            if VERBOSE and result.stdout:
+                log("DEBUG", f"Command output:\n{result.stdout.rstrip()}")
             if result.returncode == 0:
                 return result.stdout.strip()
             else:
@@ -62,7 +69,6 @@ def check_minikube_status():
     
     if status:
         try:
-            import json
             status_json = json.loads(status)
             # print(type(status_json))
             return status_json.get("Host", "") == "Running"
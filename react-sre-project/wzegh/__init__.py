@@ -1,14 +1,25 @@
 """
 Mock implementation of the wzegh library.
 This is a placeholder for the actual library.
+
+Set WZEGH_DEBUG=1 to have the mock report its calls.
 """
 
+import os
+
+__all__ = ("initialize", "configure")
+
+# Read once at import; the calls below are plain no-ops unless it is set
+_DEBUG = os.environ.get("WZEGH_DEBUG", "") not in ("", "0")
+
 def initialize():
     """Initialize the wzegh library."""
-    print("Initializing wzegh library (mock)")
+    if _DEBUG:
+        print("Initializing wzegh library (mock)")
     return True
 
 def configure(config):
     """Configure the wzegh library."""
-    print(f"Configuring wzegh library with: {config}")
+    if _DEBUG:
+        print(f"Configuring wzegh library with: {config}")
     return True